@@ -0,0 +1,51 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'robot_positions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('x', sa.Integer(), nullable=False),
+        sa.Column('y', sa.Integer(), nullable=False),
+        sa.Column('direction', sa.String(length=5), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_robot_positions_id', 'robot_positions', ['id'])
+    op.create_table(
+        'command_executions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('command_string', sa.Text(), nullable=False),
+        sa.Column('initial_x', sa.Integer(), nullable=False),
+        sa.Column('initial_y', sa.Integer(), nullable=False),
+        sa.Column('initial_direction', sa.String(length=5), nullable=False),
+        sa.Column('final_x', sa.Integer(), nullable=False),
+        sa.Column('final_y', sa.Integer(), nullable=False),
+        sa.Column('final_direction', sa.String(length=5), nullable=False),
+        sa.Column('obstacle_hit', sa.String(length=10), nullable=True),
+        sa.Column('executed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_command_executions_id', 'command_executions', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_command_executions_id', table_name='command_executions')
+    op.drop_table('command_executions')
+    op.drop_index('ix_robot_positions_id', table_name='robot_positions')
+    op.drop_table('robot_positions')
@@ -0,0 +1,32 @@
+"""add robot_id for multi-robot fleets
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ('robot_positions', 'command_executions'):
+        # Existing rows belong to the single robot that predates fleets
+        op.add_column(
+            table,
+            sa.Column('robot_id', sa.String(length=64), nullable=False, server_default='default'),
+        )
+        op.create_index(f'ix_{table}_robot_id_id', table, ['robot_id', 'id'])
+
+
+def downgrade() -> None:
+    for table in ('robot_positions', 'command_executions'):
+        op.drop_index(f'ix_{table}_robot_id_id', table_name=table)
+        op.drop_column(table, 'robot_id')
@@ -0,0 +1,85 @@
+"""Fleet of robots sharing one obstacle map.
+
+Each robot gets its own :class:`RobotService` (cached position, rows tagged
+with its ``robot_id``) and its own :class:`CommandScheduler`, so commands for
+one robot are serialized while different robots run fully in parallel. All
+robots register their cell in a shared occupancy index and treat the other
+robots as obstacles.
+"""
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RobotPosition, DEFAULT_ROBOT_ID
+from app.obstacles import OccupancyIndex
+from app.persistence import WriteBehindWriter
+from app.robot_service import RobotService
+from app.scheduler import CommandScheduler
+from app.schemas import RobotPositionResponse
+
+
+class Fleet:
+    def __init__(self):
+        self.occupancy = OccupancyIndex()
+        self.writer: Optional[WriteBehindWriter] = None
+        # The default robot loads the obstacle map shared by the whole fleet
+        default = RobotService(DEFAULT_ROBOT_ID, occupancy=self.occupancy)
+        self.obstacles = default.obstacles
+        self._robots: Dict[str, RobotService] = {DEFAULT_ROBOT_ID: default}
+        self._schedulers: Dict[str, CommandScheduler] = {}
+
+    def __contains__(self, robot_id: str) -> bool:
+        return robot_id in self._robots
+
+    def __len__(self) -> int:
+        return len(self._robots)
+
+    def robot(self, robot_id: str) -> RobotService:
+        service = self._robots.get(robot_id)
+        if service is None:
+            service = RobotService(robot_id, obstacles=self.obstacles, occupancy=self.occupancy)
+            service.writer = self.writer
+            self._robots[robot_id] = service
+        return service
+
+    def scheduler(self, robot_id: str) -> CommandScheduler:
+        scheduler = self._schedulers.get(robot_id)
+        if scheduler is None:
+            scheduler = CommandScheduler(self.robot(robot_id))
+            self._schedulers[robot_id] = scheduler
+        return scheduler
+
+    def set_writer(self, writer: Optional[WriteBehindWriter]) -> None:
+        self.writer = writer
+        for service in self._robots.values():
+            service.writer = writer
+
+    async def load_positions(self, db: AsyncSession) -> None:
+        """Load the latest position of every known robot into memory."""
+        latest_ids = (
+            select(func.max(RobotPosition.id))
+            .group_by(RobotPosition.robot_id)
+            .scalar_subquery()
+        )
+        result = await db.execute(select(RobotPosition).where(RobotPosition.id.in_(latest_ids)))
+        for row in result.scalars():
+            self.robot(row.robot_id)._set_position(
+                RobotPositionResponse(x=row.x, y=row.y, direction=row.direction)
+            )
+        default = self.robot(DEFAULT_ROBOT_ID)
+        if default._position is None:
+            await default.load_position(db)
+
+    def reset(self) -> None:
+        """Forget every cached position and all robots but the default one."""
+        for service in self._robots.values():
+            service.invalidate_position()
+        default = self._robots[DEFAULT_ROBOT_ID]
+        self._robots = {DEFAULT_ROBOT_ID: default}
+        self._schedulers = {
+            robot_id: scheduler
+            for robot_id, scheduler in self._schedulers.items()
+            if robot_id == DEFAULT_ROBOT_ID
+        }
+        self.occupancy.clear()
@@ -1,9 +1,13 @@
+import json
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db, engine, Base
-from app.robot_service import RobotService
+from app.database import get_db, engine, async_session_maker, Base
+from app.persistence import WriteBehindWriter
+from app.fleet import Fleet
+from app.models import DEFAULT_ROBOT_ID
 from app.schemas import RobotPositionResponse, CommandRequest, CommandResponse
 
 
@@ -16,17 +20,33 @@ async def lifespan(app: FastAPI):
     - On startup (before yielding): optionally create DB tables if explicitly
       enabled via RUN_DB_SETUP environment variable. This avoids touching the
       real database during tests, keeping tests fast and isolated.
-    - On shutdown (after yield): currently no cleanup required.
+    - Load the current position of every robot into the in-memory cache so
+      that position reads are served without a database round trip.
+    - Start the write-behind writer if WRITE_BEHIND is enabled.
+    - On shutdown (after yield): flush rows still queued by the writer.
     """
     run_db_setup = os.getenv("RUN_DB_SETUP", "0").lower() in {"1", "true", "yes"}
     if run_db_setup:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as db:
+        await fleet.load_positions(db)
+    writer = WriteBehindWriter.from_env(async_session_maker)
+    if writer is not None:
+        writer.start()
+        fleet.set_writer(writer)
     yield
-    # No shutdown actions needed for now
+    if writer is not None:
+        fleet.set_writer(None)
+        await writer.close()
 
 app = FastAPI(title="Moon Robot Control API", version="1.0.0", lifespan=lifespan)
-robot_service = RobotService()
+fleet = Fleet()
+# The unscoped /position and /execute endpoints drive the default robot
+robot_service = fleet.robot(DEFAULT_ROBOT_ID)
+scheduler = fleet.scheduler(DEFAULT_ROBOT_ID)
+
+RobotId = Path(..., min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_.-]+$")
 
 @app.get("/")
 async def root():
@@ -41,4 +61,46 @@ async def execute_commands(
     request: CommandRequest, 
     db: AsyncSession = Depends(get_db)
 ):
-    return await robot_service.execute_commands(db, request.commands)
\ No newline at end of file
+    return await scheduler.submit(db, request.commands)
+
+@app.post("/execute/stream")
+async def execute_commands_stream(
+    request: Request,
+    every: int = Query(1000, ge=1),
+    db: AsyncSession = Depends(get_db)
+):
+    """Execute a raw command string sent as the request body.
+
+    Responds with NDJSON events: a ``pose`` every ``every`` movement steps,
+    an ``obstacle`` event if the robot is stopped and a final ``done`` event
+    shaped like the /execute response.
+    """
+    return _stream_execution(DEFAULT_ROBOT_ID, request, every, db)
+
+@app.get("/robots/{robot_id}/position", response_model=RobotPositionResponse)
+async def get_robot_position(robot_id: str = RobotId, db: AsyncSession = Depends(get_db)):
+    return await fleet.robot(robot_id).get_current_position(db)
+
+@app.post("/robots/{robot_id}/execute", response_model=CommandResponse)
+async def execute_robot_commands(
+    request: CommandRequest,
+    robot_id: str = RobotId,
+    db: AsyncSession = Depends(get_db)
+):
+    return await fleet.scheduler(robot_id).submit(db, request.commands)
+
+@app.post("/robots/{robot_id}/execute/stream")
+async def execute_robot_commands_stream(
+    request: Request,
+    robot_id: str = RobotId,
+    every: int = Query(1000, ge=1),
+    db: AsyncSession = Depends(get_db)
+):
+    return _stream_execution(robot_id, request, every, db)
+
+def _stream_execution(robot_id: str, request: Request, every: int, db: AsyncSession):
+    async def events():
+        async with fleet.scheduler(robot_id).exclusive():
+            async for event in fleet.robot(robot_id).execute_stream(db, request.stream(), every):
+                yield json.dumps(event) + "\n"
+    return StreamingResponse(events(), media_type="application/x-ndjson")
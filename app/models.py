@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
+DEFAULT_ROBOT_ID = "default"
+
 class RobotPosition(Base):
     __tablename__ = "robot_positions"
+    __table_args__ = (
+        Index("ix_robot_positions_robot_id_id", "robot_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
+    robot_id = Column(String(64), nullable=False, default=DEFAULT_ROBOT_ID, server_default=DEFAULT_ROBOT_ID)
     x = Column(Integer, nullable=False)
     y = Column(Integer, nullable=False)
     direction = Column(String(5), nullable=False)  # NORTH, SOUTH, EAST, WEST
@@ -13,8 +19,12 @@ class RobotPosition(Base):
 
 class CommandExecution(Base):
     __tablename__ = "command_executions"
+    __table_args__ = (
+        Index("ix_command_executions_robot_id_id", "robot_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
+    robot_id = Column(String(64), nullable=False, default=DEFAULT_ROBOT_ID, server_default=DEFAULT_ROBOT_ID)
     command_string = Column(Text, nullable=False)
     initial_x = Column(Integer, nullable=False)
     initial_y = Column(Integer, nullable=False)
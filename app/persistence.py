@@ -0,0 +1,137 @@
+"""Write-behind persistence of position history and command executions.
+
+When enabled, ``/execute`` only updates the in-memory robot state and queues
+the ``RobotPosition``/``CommandExecution`` rows. A background task flushes the
+queue in multi-row INSERT batches, trading one commit per request for one
+commit per batch.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import RobotPosition, CommandExecution
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+PendingWrite = Tuple[Row, Row]
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        max_batch_size: int = 500,
+        max_latency: float = 0.05,
+        max_queue_size: int = 10000,
+        max_retries: int = 3,
+    ):
+        """Batching writer for execution rows.
+
+        ``max_batch_size`` caps the rows of each kind per INSERT,
+        ``max_latency`` (seconds) bounds how long a queued row waits for its
+        batch to fill, and ``max_queue_size`` bounds the number of pending
+        executions: once full, :meth:`submit` waits for the flusher
+        (backpressure) instead of growing memory without limit.
+        """
+        self.session_maker = session_maker
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_retries = max_retries
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, session_maker: async_sessionmaker) -> Optional["WriteBehindWriter"]:
+        """Build a writer if WRITE_BEHIND is enabled, otherwise return None."""
+        if os.getenv("WRITE_BEHIND", "0").lower() not in {"1", "true", "yes"}:
+            return None
+        return cls(
+            session_maker,
+            max_batch_size=int(os.getenv("WRITE_BEHIND_MAX_BATCH", "500")),
+            max_latency=int(os.getenv("WRITE_BEHIND_MAX_LATENCY_MS", "50")) / 1000,
+            max_queue_size=int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "10000")),
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, position: Row, execution: Row) -> None:
+        """Queue one execution, waiting while the queue is full."""
+        if self._closed:
+            raise RuntimeError("write-behind writer is closed")
+        await self._queue.put((position, execution))
+
+    async def close(self) -> None:
+        """Stop accepting rows and flush everything still queued."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is None:
+            # Never started: flush synchronously
+            batch: List[PendingWrite] = []
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for start in range(0, len(batch), self.max_batch_size):
+                await self._flush(batch[start:start + self.max_batch_size])
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch: List[PendingWrite] = [item]
+            deadline = loop.time() + self.max_latency
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: List[PendingWrite]) -> None:
+        if not batch:
+            return
+        positions = [position for position, _ in batch]
+        executions = [execution for _, execution in batch]
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.session_maker() as session:
+                    await session.execute(insert(RobotPosition).values(positions))
+                    await session.execute(insert(CommandExecution).values(executions))
+                    await session.commit()
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception("Dropping %d queued executions after failed flush", len(batch))
+                    return
+                logger.warning("Write-behind flush failed, retrying (attempt %d)", attempt)
+                await asyncio.sleep(0.1 * attempt)
@@ -1,10 +1,16 @@
 import os
 import ast
-from typing import Tuple, Optional, Set, Iterable
+import codecs
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Tuple, Optional, Set, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
-from app.models import RobotPosition, CommandExecution
+from app.models import RobotPosition, CommandExecution, DEFAULT_ROBOT_ID
 from app.schemas import RobotPositionResponse, CommandResponse
+from app.obstacles import ObstacleIndex, ObstacleUnion, OccupancyIndex
+from app.persistence import WriteBehindWriter
+from app.simulation import (
+    DIRECTION_CODES, DIRECTION_NAMES, ProgressiveRun, compile_commands, run_program
+)
 
 class Direction:
     NORTH = "NORTH"
@@ -13,19 +19,35 @@ class Direction:
     WEST = "WEST"
 
 class RobotService:
-    def __init__(self):
+    def __init__(
+        self,
+        robot_id: str = DEFAULT_ROBOT_ID,
+        obstacles: Optional[ObstacleIndex] = None,
+        occupancy: Optional[OccupancyIndex] = None,
+    ):
         """Robot control service.
 
         Reads initial position and obstacle configuration from environment
         variables with safe defaults. Uses a database to persist the latest
-        position and a history of executed commands.
+        position and a history of executed commands. The current position is
+        cached in memory once read, so it is only queried again after
+        :meth:`invalidate_position` (e.g. after a failed commit).
+
+        In a fleet every robot has its own service keyed by ``robot_id``;
+        the obstacle map is shared and ``occupancy`` holds the cells of all
+        robots so they cannot drive into each other.
         """
+        self.robot_id = robot_id
         self.start_x = int(os.getenv("START_X", "4"))
         self.start_y = int(os.getenv("START_Y", "2"))
         self.start_direction = os.getenv("START_DIRECTION", "WEST")
-        self.obstacles = self._load_obstacles()
+        self.obstacles = obstacles if obstacles is not None else self._load_obstacles()
+        self.occupancy = occupancy
+        self._position: Optional[RobotPositionResponse] = None
+        # Set by the application when write-behind persistence is enabled
+        self.writer: Optional[WriteBehindWriter] = None
     
-    def _load_obstacles(self) -> Set[Tuple[int, int]]:
+    def _load_obstacles(self) -> ObstacleIndex:
         """Load obstacles configuration from environment safely.
 
         The expected format is a Python-like set of tuples, for example:
@@ -45,33 +67,67 @@ class RobotService:
                         and all(isinstance(v, int) for v in item)
                     ):
                         result.add((int(item[0]), int(item[1])))
-                return result or default_obstacles
+                return ObstacleIndex(result or default_obstacles)
         except Exception:
             pass
-        return default_obstacles
+        return ObstacleIndex(default_obstacles)
     
     async def get_current_position(self, db: AsyncSession) -> RobotPositionResponse:
+        if self._position is None:
+            return await self.load_position(db)
+        return self._position
+    
+    async def load_position(self, db: AsyncSession) -> RobotPositionResponse:
+        """Read the latest position from the database into the cache."""
         result = await db.execute(
-            select(RobotPosition).order_by(desc(RobotPosition.id)).limit(1)
+            select(RobotPosition)
+            .where(RobotPosition.robot_id == self.robot_id)
+            .order_by(desc(RobotPosition.id))
+            .limit(1)
         )
         latest_position = result.scalar_one_or_none()
         
         if latest_position is None:
             await self._initialize_position(db)
-            return RobotPositionResponse(
+            position = RobotPositionResponse(
                 x=self.start_x, 
                 y=self.start_y, 
                 direction=self.start_direction
             )
+        else:
+            position = RobotPositionResponse(
+                x=latest_position.x,
+                y=latest_position.y,
+                direction=latest_position.direction
+            )
         
-        return RobotPositionResponse(
-            x=latest_position.x,
-            y=latest_position.y,
-            direction=latest_position.direction
-        )
+        self._set_position(position)
+        return position
+    
+    def invalidate_position(self) -> None:
+        """Drop the cached position so the next read goes to the database."""
+        self._set_position(None)
+    
+    def _set_position(self, position: Optional[RobotPositionResponse]) -> None:
+        if self.occupancy is not None:
+            if self._position is not None:
+                self.occupancy.discard((self._position.x, self._position.y))
+            if position is not None:
+                self.occupancy.add((position.x, position.y))
+        self._position = position
+    
+    async def _commit(self, db: AsyncSession) -> None:
+        try:
+            await db.commit()
+        except Exception:
+            # The cache may no longer match what is stored
+            await db.rollback()
+            self.invalidate_position()
+            raise
     
     async def _initialize_position(self, db: AsyncSession):
         initial_position = RobotPosition(
+            robot_id=self.robot_id,
             x=self.start_x,
             y=self.start_y,
             direction=self.start_direction
@@ -81,9 +137,10 @@ class RobotService:
         return initial_position
     
     async def update_position(self, db: AsyncSession, x: int, y: int, direction: str):
-        new_position = RobotPosition(x=x, y=y, direction=direction)
+        new_position = RobotPosition(robot_id=self.robot_id, x=x, y=y, direction=direction)
         db.add(new_position)
-        await db.commit()
+        await self._commit(db)
+        self._set_position(RobotPositionResponse(x=x, y=y, direction=direction))
         return new_position
     
     def _rotate_left(self, direction: str) -> str:
@@ -126,27 +183,45 @@ class RobotService:
             return x + 1, y
         return x, y
     
-    async def execute_commands(self, db: AsyncSession, command_string: str) -> CommandResponse:
-        current_pos = await self.get_current_position(db)
-        initial_position = RobotPositionResponse(
-            x=current_pos.x,
-            y=current_pos.y,
-            direction=current_pos.direction
+    def _simulate(
+        self, x: int, y: int, direction: str, command_string: str
+    ) -> Tuple[int, int, str, Optional[str]]:
+        """Run a command string from the given pose without touching the DB.
+
+        Returns the final ``(x, y, direction)`` and the formatted obstacle that
+        stopped the robot, if any.
+        """
+        code = DIRECTION_CODES.get(direction)
+        if code is None:
+            # Unknown headings keep the legacy per-character behaviour
+            return self._simulate_stepwise(x, y, direction, command_string)
+        x, y, code, hit = run_program(
+            x, y, code, compile_commands(command_string), self._blockers()
         )
-        
-        x, y, direction = current_pos.x, current_pos.y, current_pos.direction
+        obstacle_hit = f"({hit[0]},{hit[1]})" if hit is not None else None
+        return x, y, DIRECTION_NAMES[code], obstacle_hit
+    
+    def _blockers(self):
+        if self.occupancy is None:
+            return self.obstacles
+        return ObstacleUnion(self.obstacles, self.occupancy)
+    
+    def _simulate_stepwise(
+        self, x: int, y: int, direction: str, command_string: str
+    ) -> Tuple[int, int, str, Optional[str]]:
+        """Reference interpreter executing one character at a time."""
+        blockers = self._blockers()
         obstacle_hit = None
-        
         for command in command_string.upper():
             if command == 'F':
                 new_x, new_y = self._move_forward(x, y, direction)
-                if (new_x, new_y) in self.obstacles:
+                if (new_x, new_y) in blockers:
                     obstacle_hit = f"({new_x},{new_y})"
                     break
                 x, y = new_x, new_y
             elif command == 'B':
                 new_x, new_y = self._move_backward(x, y, direction)
-                if (new_x, new_y) in self.obstacles:
+                if (new_x, new_y) in blockers:
                     obstacle_hit = f"({new_x},{new_y})"
                     break
                 x, y = new_x, new_y
@@ -154,33 +229,178 @@ class RobotService:
                 direction = self._rotate_left(direction)
             elif command == 'R':
                 direction = self._rotate_right(direction)
+        return x, y, direction, obstacle_hit
+    
+    async def execute_commands(self, db: AsyncSession, command_string: str) -> CommandResponse:
+        responses = await self.execute_many(db, [command_string])
+        return responses[0]
+    
+    async def execute_many(
+        self, db: AsyncSession, command_strings: List[str]
+    ) -> List[CommandResponse]:
+        """Execute several command strings in order.
+
+        Each program starts from the final position of the previous one and
+        all resulting rows are persisted in a single transaction.
+        """
+        current_pos = await self.get_current_position(db)
         
-        # Update position and log command execution in single transaction
-        new_position = RobotPosition(x=x, y=y, direction=direction)
-        db.add(new_position)
+        positions: List[RobotPosition] = []
+        executions: List[CommandExecution] = []
+        responses: List[CommandResponse] = []
+        own_cell = (current_pos.x, current_pos.y)
+        if self.occupancy is not None:
+            # The robot must not collide with the cell it is leaving
+            self.occupancy.discard(own_cell)
+        try:
+            for command_string in command_strings:
+                initial_position = current_pos
+                x, y, direction, obstacle_hit = self._simulate(
+                    initial_position.x, initial_position.y, initial_position.direction, command_string
+                )
+                
+                positions.append(RobotPosition(robot_id=self.robot_id, x=x, y=y, direction=direction))
+                executions.append(CommandExecution(
+                    robot_id=self.robot_id,
+                    command_string=command_string,
+                    initial_x=initial_position.x,
+                    initial_y=initial_position.y,
+                    initial_direction=initial_position.direction,
+                    final_x=x,
+                    final_y=y,
+                    final_direction=direction,
+                    obstacle_hit=obstacle_hit
+                ))
+                current_pos = RobotPositionResponse(x=x, y=y, direction=direction)
+                
+                message = "Commands executed successfully"
+                if obstacle_hit:
+                    message = f"Stopped due to obstacle at {obstacle_hit}"
+                
+                responses.append(CommandResponse(
+                    initial_position=initial_position,
+                    final_position=current_pos,
+                    obstacle_hit=obstacle_hit,
+                    message=message
+                ))
+        finally:
+            if self.occupancy is not None:
+                self.occupancy.add(own_cell)
         
-        command_execution = CommandExecution(
-            command_string=command_string,
-            initial_x=initial_position.x,
-            initial_y=initial_position.y,
-            initial_direction=initial_position.direction,
-            final_x=x,
-            final_y=y,
-            final_direction=direction,
-            obstacle_hit=obstacle_hit
-        )
-        db.add(command_execution)
-        await db.commit()
+        await self._persist(db, positions, executions, current_pos)
+        return responses
+    
+    async def execute_stream(
+        self, db: AsyncSession, chunks: AsyncIterable[bytes], every: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a command string streamed in chunks, yielding progress events.
+
+        Yields a ``pose`` event every ``every`` movement steps, an
+        ``obstacle`` event if the robot is stopped and a final ``done`` event
+        shaped like :class:`CommandResponse`. Chunks are executed as they
+        arrive; only the raw text is kept, to be stored with the execution.
+        """
+        initial_position = await self.get_current_position(db)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        parts: List[str] = []
+        own_cell = (initial_position.x, initial_position.y)
+        code = DIRECTION_CODES.get(initial_position.direction)
+        run = None
+        if code is not None:
+            run = ProgressiveRun(
+                initial_position.x, initial_position.y, code, self._blockers(), every
+            )
+        
+        async for chunk in chunks:
+            text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            parts.append(text)
+            if run is None or run.hit is not None:
+                continue
+            if self.occupancy is not None:
+                self.occupancy.discard(own_cell)
+            try:
+                poses = run.feed(text)
+            finally:
+                if self.occupancy is not None:
+                    self.occupancy.add(own_cell)
+            for steps, x, y, direction in poses:
+                yield {
+                    "event": "pose",
+                    "steps": steps,
+                    "x": x,
+                    "y": y,
+                    "direction": DIRECTION_NAMES[direction],
+                }
+            if run.hit is not None:
+                yield {
+                    "event": "obstacle",
+                    "steps": run.steps,
+                    "x": run.x,
+                    "y": run.y,
+                    "direction": DIRECTION_NAMES[run.direction],
+                    "obstacle_hit": f"({run.hit[0]},{run.hit[1]})",
+                }
+        parts.append(decoder.decode(b"", final=True))
+        command_string = "".join(parts)
+        
+        if run is None:
+            # Unknown headings keep the legacy per-character behaviour
+            x, y, direction, obstacle_hit = self._simulate(
+                initial_position.x, initial_position.y, initial_position.direction, command_string
+            )
+        else:
+            x, y, direction = run.x, run.y, DIRECTION_NAMES[run.direction]
+            obstacle_hit = f"({run.hit[0]},{run.hit[1]})" if run.hit is not None else None
         
         final_position = RobotPositionResponse(x=x, y=y, direction=direction)
+        await self._persist(
+            db,
+            [RobotPosition(robot_id=self.robot_id, x=x, y=y, direction=direction)],
+            [CommandExecution(
+                robot_id=self.robot_id,
+                command_string=command_string,
+                initial_x=initial_position.x,
+                initial_y=initial_position.y,
+                initial_direction=initial_position.direction,
+                final_x=x,
+                final_y=y,
+                final_direction=direction,
+                obstacle_hit=obstacle_hit
+            )],
+            final_position,
+        )
         
         message = "Commands executed successfully"
         if obstacle_hit:
             message = f"Stopped due to obstacle at {obstacle_hit}"
-        
-        return CommandResponse(
+        response = CommandResponse(
             initial_position=initial_position,
             final_position=final_position,
             obstacle_hit=obstacle_hit,
             message=message
-        )
\ No newline at end of file
+        )
+        yield {"event": "done", **response.model_dump()}
+    
+    async def _persist(
+        self,
+        db: AsyncSession,
+        positions: List[RobotPosition],
+        executions: List[CommandExecution],
+        final_position: RobotPositionResponse,
+    ) -> None:
+        if self.writer is not None:
+            # Write-behind: the in-memory state is authoritative, rows follow
+            self._set_position(final_position)
+            for position, execution in zip(positions, executions):
+                await self.writer.submit(_row(position), _row(execution))
+        else:
+            # Update position and log command executions in single transaction
+            db.add_all(positions)
+            db.add_all(executions)
+            await self._commit(db)
+            self._set_position(final_position)
+
+
+def _row(instance) -> Dict[str, Any]:
+    """Column values of a pending ORM instance, for bulk inserts."""
+    return {key: value for key, value in vars(instance).items() if not key.startswith("_sa_")}
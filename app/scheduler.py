@@ -0,0 +1,126 @@
+"""Serialized command execution in front of :class:`RobotService`.
+
+Concurrent ``/execute`` requests used to read the same starting position and
+overwrite each other's movement. The scheduler keeps one ordered queue per
+robot and a single worker that applies jobs in arrival order. Command jobs
+that are waiting together are coalesced into one ``execute_many`` call, so a
+burst of requests costs a single transaction.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.robot_service import RobotService
+from app.schemas import CommandResponse
+
+
+class _Job:
+    __slots__ = ("db", "commands", "func", "future")
+
+    def __init__(self, future: asyncio.Future, db=None, commands=None, func=None):
+        self.future = future
+        self.db = db
+        self.commands = commands
+        self.func = func
+
+
+class CommandScheduler:
+    def __init__(self, service: RobotService, max_batch_size: int = 100):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self._jobs: Deque[_Job] = deque()
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    async def submit(self, db: AsyncSession, command_string: str) -> CommandResponse:
+        """Queue a command string and wait for its result.
+
+        ``db`` is used to persist the batch this job ends up in when it is
+        the first live job of that batch.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_Job(future, db=db, commands=command_string))
+        return await future
+
+    async def run_exclusive(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` in queue order with no other job running meanwhile."""
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_Job(future, func=func))
+        return await future
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        """Hold this robot's queue for the duration of the ``async with`` block.
+
+        Waits for the jobs queued before it; jobs submitted meanwhile wait
+        until the block exits.
+        """
+        loop = asyncio.get_running_loop()
+        turn = loop.create_future()
+        released = asyncio.Event()
+
+        async def hold():
+            turn.set_result(None)
+            await released.wait()
+
+        job = asyncio.ensure_future(self.run_exclusive(hold))
+        try:
+            await turn
+            yield
+        finally:
+            released.set()
+            if not turn.done():
+                # Gave up before our turn: the worker skips the cancelled job
+                job.cancel()
+
+    def _enqueue(self, job: _Job) -> None:
+        self._jobs.append(job)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        # The worker exits once the queue is drained and is restarted by the
+        # next submission, so it never outlives the event loop it runs on.
+        while self._jobs:
+            job = self._jobs.popleft()
+            if job.future.done():  # cancelled by a disconnected client
+                continue
+            if job.func is not None:
+                await self._run_exclusive(job)
+                continue
+            batch = [job]
+            while self._jobs and len(batch) < self.max_batch_size and self._jobs[0].func is None:
+                job = self._jobs.popleft()
+                if not job.future.done():
+                    batch.append(job)
+            await self._execute(batch)
+
+    async def _run_exclusive(self, job: _Job) -> None:
+        try:
+            result = await job.func()
+        except Exception as exc:
+            if not job.future.done():
+                job.future.set_exception(exc)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+
+    async def _execute(self, batch: List[_Job]) -> None:
+        try:
+            responses = await self.service.execute_many(
+                batch[0].db, [job.commands for job in batch]
+            )
+        except Exception as exc:
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            return
+        for job, response in zip(batch, responses):
+            if not job.future.done():
+                job.future.set_result(response)
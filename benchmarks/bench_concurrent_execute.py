@@ -0,0 +1,70 @@
+"""Throughput of POST /execute under concurrent clients.
+
+Runs the app in-process against an in-memory SQLite database (requires
+``aiosqlite``) and checks that no movement is lost under concurrency.
+
+Usage::
+
+    python -m benchmarks.bench_concurrent_execute --clients 50 --requests 20
+"""
+import argparse
+import asyncio
+import time
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app, robot_service
+
+
+async def run(clients: int, requests: int) -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_db_bench():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_db_bench
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    robot_service.invalidate_position()
+
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        start_x = (await client.get("/position")).json()["x"]
+
+        async def worker():
+            for _ in range(requests):
+                response = await client.post("/execute", json={"commands": "B"})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        final_x = (await client.get("/position")).json()["x"]
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    total = clients * requests
+    print(f"clients: {clients}, requests: {total}")
+    print(f"elapsed: {elapsed:.3f} s, throughput: {total / elapsed:.0f} req/s")
+    print(f"lost updates: {total - (final_x - start_x)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
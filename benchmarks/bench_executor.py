@@ -0,0 +1,64 @@
+"""Compare the compiled executor with the per-character interpreter.
+
+Usage::
+
+    python -m benchmarks.bench_executor --length 1000000 --obstacles 20000
+"""
+import argparse
+import random
+import time
+
+from app.obstacles import ObstacleIndex
+from app.robot_service import RobotService
+
+
+def make_program(length: int, seed: int) -> str:
+    """Planner-like program: long straight runs separated by turns."""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < length:
+        run = rng.choice("FB") * rng.randint(1, 50) + rng.choice(["L", "R", "LL", ""])
+        parts.append(run)
+        size += len(run)
+    return "".join(parts)[:length]
+
+
+def best_of(repeat: int, func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--length", type=int, default=1_000_000)
+    parser.add_argument("--obstacles", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    service = RobotService()
+    # Keep obstacles far away so both engines run the whole program
+    service.obstacles = ObstacleIndex(
+        (rng.randint(10**7, 2 * 10**7), rng.randint(10**7, 2 * 10**7))
+        for _ in range(args.obstacles)
+    )
+    program = make_program(args.length, args.seed)
+
+    legacy_time, legacy = best_of(args.repeat, service._simulate_stepwise, 0, 0, "NORTH", program)
+    compiled_time, compiled = best_of(args.repeat, service._simulate, 0, 0, "NORTH", program)
+    assert legacy == compiled, (legacy, compiled)
+
+    print(f"commands: {args.length}, obstacles: {len(service.obstacles)}")
+    print(f"stepwise: {legacy_time * 1000:10.2f} ms")
+    print(f"compiled: {compiled_time * 1000:10.2f} ms  ({legacy_time / compiled_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
-from app.main import app
+from app.main import app, fleet
 from app.database import get_db, Base
 
 DATABASE_URL_TEST = "sqlite+aiosqlite:///:memory:"
@@ -22,6 +22,8 @@ async def get_db_test():
 @pytest_asyncio.fixture
 async def async_client():
     app.dependency_overrides[get_db] = get_db_test
+    # Tables are recreated per test, so the cached position must be too
+    fleet.reset()
     # Create tables before each test
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -30,6 +32,7 @@ async def async_client():
         yield ac
     
     app.dependency_overrides.clear()
+    fleet.reset()
     # Clean up tables after each test
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
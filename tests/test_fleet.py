@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from app.fleet import Fleet
+from app.models import CommandExecution
+from tests.conftest import async_session_maker_test
+
+@pytest.mark.asyncio
+async def test_robots_have_independent_positions(async_client: AsyncClient):
+    await async_client.post("/robots/rover-1/execute", json={"commands": "FF"})
+    await async_client.post("/robots/rover-2/execute", json={"commands": "B"})
+
+    rover_1 = (await async_client.get("/robots/rover-1/position")).json()
+    rover_2 = (await async_client.get("/robots/rover-2/position")).json()
+    default = (await async_client.get("/position")).json()
+
+    assert rover_1["x"] == 2
+    assert rover_2["x"] == 5
+    assert default["x"] == 4
+
+@pytest.mark.asyncio
+async def test_default_robot_is_shared_with_unscoped_endpoints(async_client: AsyncClient):
+    await async_client.post("/execute", json={"commands": "F"})
+
+    response = await async_client.get("/robots/default/position")
+    assert response.json()["x"] == 3
+
+@pytest.mark.asyncio
+async def test_robot_stops_before_another_robot(async_client: AsyncClient):
+    await async_client.post("/robots/rover-1/execute", json={"commands": "FF"})
+
+    response = await async_client.post("/robots/rover-2/execute", json={"commands": "FFF"})
+
+    data = response.json()
+    assert data["obstacle_hit"] == "(2,2)"
+    assert data["final_position"]["x"] == 3
+
+@pytest.mark.asyncio
+async def test_robot_can_return_to_the_cell_it_left(async_client: AsyncClient):
+    response = await async_client.post("/robots/rover-1/execute", json={"commands": "FB"})
+
+    data = response.json()
+    assert data["obstacle_hit"] is None
+    assert data["final_position"]["x"] == 4
+
+@pytest.mark.asyncio
+async def test_executions_are_tagged_with_robot_id(async_client: AsyncClient):
+    await asyncio.gather(
+        async_client.post("/robots/rover-1/execute", json={"commands": "F"}),
+        async_client.post("/robots/rover-2/execute", json={"commands": "B"}),
+    )
+
+    async with async_session_maker_test() as session:
+        rows = (await session.execute(select(CommandExecution))).scalars().all()
+    assert sorted(row.robot_id for row in rows) == ["rover-1", "rover-2"]
+
+@pytest.mark.asyncio
+async def test_invalid_robot_id_is_rejected(async_client: AsyncClient):
+    response = await async_client.get("/robots/bad%20id/position")
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_fleet_loads_latest_position_per_robot(async_client: AsyncClient):
+    await async_client.post("/robots/rover-1/execute", json={"commands": "F"})
+    await async_client.post("/robots/rover-1/execute", json={"commands": "F"})
+    await async_client.post("/robots/rover-2/execute", json={"commands": "B"})
+
+    fleet = Fleet()
+    async with async_session_maker_test() as session:
+        await fleet.load_positions(session)
+
+    assert "rover-1" in fleet and "rover-2" in fleet
+    assert (await fleet.robot("rover-1").get_current_position(None)).x == 2
+    assert (await fleet.robot("rover-2").get_current_position(None)).x == 5
+    assert (2, 2) in fleet.occupancy
@@ -0,0 +1,38 @@
+from app.obstacles import ObstacleIndex
+
+def test_index_behaves_like_a_set():
+    index = ObstacleIndex({(1, 4), (3, 5)})
+
+    assert (1, 4) in index
+    assert (4, 1) not in index
+    assert len(index) == 2
+    assert index == {(1, 4), (3, 5)}
+    assert set(index) == {(1, 4), (3, 5)}
+
+def test_first_blocked_along_rows():
+    index = ObstacleIndex({(3, 0), (5, 0), (-2, 0), (4, 1)})
+
+    assert index.first_blocked(0, 0, 1, 0, 10) == 3
+    assert index.first_blocked(0, 0, 1, 0, 2) is None
+    assert index.first_blocked(3, 0, 1, 0, 10) == 2
+    assert index.first_blocked(0, 0, -1, 0, 10) == 2
+    assert index.first_blocked(-2, 0, -1, 0, 10) is None
+
+def test_first_blocked_along_columns():
+    index = ObstacleIndex({(0, 2), (0, -7), (1, 1)})
+
+    assert index.first_blocked(0, 0, 0, 1, 2) == 2
+    assert index.first_blocked(0, 0, 0, 1, 1) is None
+    assert index.first_blocked(0, 0, 0, -1, 100) == 7
+    assert index.first_blocked(5, 0, 0, 1, 100) is None
+
+def test_first_blocked_matches_cell_probing():
+    cells = {(x, y) for x in range(-6, 7, 3) for y in range(-5, 6, 2)}
+    index = ObstacleIndex(cells)
+    for x in range(-8, 9):
+        for y in range(-8, 9):
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                expected = next(
+                    (i for i in range(1, 6) if (x + dx * i, y + dy * i) in cells), None
+                )
+                assert index.first_blocked(x, y, dx, dy, 5) == expected
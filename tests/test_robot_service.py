@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch
 from app.robot_service import RobotService, Direction
+from app.schemas import RobotPositionResponse
 
 @pytest.mark.asyncio
 async def test_robot_service_initialization_default():
@@ -42,4 +43,37 @@ async def test_obstacles_loading_from_env():
     }, clear=True):
         service = RobotService()
         expected_obstacles = {(2, 3), (5, 6)}
-        assert service.obstacles == expected_obstacles
\ No newline at end of file
+        assert service.obstacles == expected_obstacles
+class _FailingCommitSession:
+    def __init__(self):
+        self.rolled_back = False
+
+    def add_all(self, instances):
+        pass
+
+    async def commit(self):
+        raise RuntimeError("commit failed")
+
+    async def rollback(self):
+        self.rolled_back = True
+
+@pytest.mark.asyncio
+async def test_current_position_served_from_cache():
+    service = RobotService()
+    service._position = RobotPositionResponse(x=7, y=8, direction="EAST")
+
+    # No session is needed while the position is cached
+    position = await service.get_current_position(None)
+    assert (position.x, position.y, position.direction) == (7, 8, "EAST")
+
+@pytest.mark.asyncio
+async def test_failed_commit_invalidates_cached_position():
+    service = RobotService()
+    service._position = RobotPositionResponse(x=7, y=8, direction="EAST")
+    session = _FailingCommitSession()
+
+    with pytest.raises(RuntimeError):
+        await service.execute_commands(session, "F")
+
+    assert session.rolled_back
+    assert service._position is None
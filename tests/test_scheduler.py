@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from app.main import robot_service
+from app.scheduler import CommandScheduler
+from tests.conftest import async_session_maker_test
+
+@pytest.mark.asyncio
+async def test_concurrent_executes_are_applied_in_order(async_client: AsyncClient):
+    responses = await asyncio.gather(*(
+        async_client.post("/execute", json={"commands": "B"}) for _ in range(20)
+    ))
+
+    starts = sorted(response.json()["initial_position"]["x"] for response in responses)
+    assert starts == list(range(4, 24))
+    position = (await async_client.get("/position")).json()
+    assert position["x"] == 24
+
+@pytest.mark.asyncio
+async def test_waiting_jobs_are_coalesced_into_one_batch(async_client: AsyncClient):
+    scheduler = CommandScheduler(robot_service)
+    batches = []
+    execute_many = robot_service.execute_many
+
+    async def recording_execute_many(db, command_strings):
+        batches.append(len(command_strings))
+        return await execute_many(db, command_strings)
+
+    robot_service.execute_many = recording_execute_many
+    try:
+        async with async_session_maker_test() as db:
+            results = await asyncio.gather(*(scheduler.submit(db, "B") for _ in range(5)))
+    finally:
+        del robot_service.execute_many
+
+    assert batches == [5]
+    assert [result.final_position.x for result in results] == [5, 6, 7, 8, 9]
+
+@pytest.mark.asyncio
+async def test_exclusive_job_runs_between_command_jobs(async_client: AsyncClient):
+    scheduler = CommandScheduler(robot_service)
+    seen = []
+
+    async def snapshot():
+        seen.append(robot_service._position.x)
+        return "done"
+
+    async with async_session_maker_test() as db:
+        first = asyncio.ensure_future(scheduler.submit(db, "B"))
+        await asyncio.sleep(0)
+        exclusive = asyncio.ensure_future(scheduler.run_exclusive(snapshot))
+        second = asyncio.ensure_future(scheduler.submit(db, "B"))
+        await asyncio.gather(first, exclusive, second)
+
+    assert seen == [5]
+    assert exclusive.result() == "done"
+    assert second.result().final_position.x == 6
+
+@pytest.mark.asyncio
+async def test_failed_batch_propagates_to_every_job(async_client: AsyncClient):
+    scheduler = CommandScheduler(robot_service)
+
+    async def failing_execute_many(db, command_strings):
+        raise RuntimeError("boom")
+
+    robot_service.execute_many = failing_execute_many
+    try:
+        results = await asyncio.gather(
+            scheduler.submit(None, "F"), scheduler.submit(None, "F"), return_exceptions=True
+        )
+    finally:
+        del robot_service.execute_many
+
+    assert all(isinstance(result, RuntimeError) for result in results)
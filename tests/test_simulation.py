@@ -0,0 +1,53 @@
+import random
+from app.obstacles import ObstacleIndex
+from app.robot_service import RobotService
+from app.simulation import (
+    MOVE, TURN, NORTH, EAST, WEST, ProgressiveRun, compile_commands, run_program
+)
+
+def test_compile_collapses_runs():
+    assert compile_commands("FFFRRBB") == [(MOVE, 3), (TURN, 2), (MOVE, -2)]
+    assert compile_commands("LLL") == [(TURN, 1)]
+    assert compile_commands("frl") == [(MOVE, 1)]
+
+def test_compile_merges_moves_around_cancelled_turns():
+    assert compile_commands("FLRF") == [(MOVE, 2)]
+    assert compile_commands("FLRB") == [(MOVE, 1), (MOVE, -1)]
+
+def test_compile_ignores_unknown_characters():
+    assert compile_commands("F x F?") == [(MOVE, 2)]
+    assert compile_commands("") == []
+
+def test_run_program_stops_before_obstacle():
+    x, y, direction, hit = run_program(0, 4, EAST, compile_commands("FFF"), ObstacleIndex({(2, 4)}))
+    assert (x, y, direction, hit) == (1, 4, EAST, (2, 4))
+
+def test_run_program_backward_and_turns():
+    x, y, direction, hit = run_program(0, 0, NORTH, compile_commands("LBBBR"), ObstacleIndex())
+    assert (x, y, direction, hit) == (3, 0, NORTH, None)
+    x, y, direction, hit = run_program(0, 0, NORTH, compile_commands("L"), ObstacleIndex())
+    assert direction == WEST
+
+def test_compiled_engine_matches_stepwise_interpreter():
+    service = RobotService()
+    rng = random.Random(42)
+    for _ in range(300):
+        obstacles = {(rng.randint(-5, 5), rng.randint(-5, 5)) for _ in range(rng.randint(0, 15))}
+        service.obstacles = ObstacleIndex(obstacles)
+        commands = "".join(rng.choice("FFFBBLRfblr ") for _ in range(rng.randint(0, 60)))
+        start = (rng.randint(-5, 5), rng.randint(-5, 5), rng.choice(["NORTH", "SOUTH", "EAST", "WEST"]))
+        assert service._simulate(*start, commands) == service._simulate_stepwise(*start, commands)
+
+def test_progressive_run_matches_run_program_across_chunks():
+    obstacles = ObstacleIndex({(0, 30), (-12, 5)})
+    commands = "FFFFFFFFFFLFFFFFFFFFFFFFFRRFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF"
+    expected = run_program(0, 0, NORTH, compile_commands(commands), obstacles)
+
+    run = ProgressiveRun(0, 0, NORTH, obstacles, every=7)
+    poses = []
+    for start in range(0, len(commands), 9):
+        poses.extend(run.feed(commands[start:start + 9]))
+
+    assert (run.x, run.y, run.direction, run.hit) == expected
+    assert [steps for steps, *_ in poses] == list(range(7, run.steps + 1, 7))
+    assert poses[0] == (7, 0, 7, NORTH)
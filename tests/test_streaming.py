@@ -0,0 +1,51 @@
+import json
+import pytest
+from httpx import AsyncClient
+
+def _events(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+@pytest.mark.asyncio
+async def test_stream_reports_progress_and_final_position(async_client: AsyncClient):
+    response = await async_client.post("/execute/stream?every=2", content=b"BBBBB")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = _events(response)
+    assert [event["event"] for event in events] == ["pose", "pose", "done"]
+    assert [(event["steps"], event["x"]) for event in events[:2]] == [(2, 6), (4, 8)]
+    done = events[-1]
+    assert done["initial_position"] == {"x": 4, "y": 2, "direction": "WEST"}
+    assert done["final_position"] == {"x": 9, "y": 2, "direction": "WEST"}
+    assert done["obstacle_hit"] is None
+
+@pytest.mark.asyncio
+async def test_stream_accepts_chunked_body(async_client: AsyncClient):
+    async def body():
+        for chunk in (b"ff", b"FR", b"f", b"fl"):
+            yield chunk
+
+    response = await async_client.post("/execute/stream", content=body())
+
+    done = _events(response)[-1]
+    assert done["final_position"] == {"x": 0, "y": 4, "direction": "WEST"}
+
+@pytest.mark.asyncio
+async def test_stream_emits_obstacle_event(async_client: AsyncClient):
+    await async_client.post("/execute", json={"commands": "FFFFRFF"})
+
+    response = await async_client.post("/execute/stream", content=b"RFFF")
+
+    events = _events(response)
+    assert [event["event"] for event in events] == ["obstacle", "done"]
+    assert events[0]["obstacle_hit"] == "(1,4)"
+    assert (events[0]["x"], events[0]["y"]) == (0, 4)
+    assert events[-1]["message"] == "Stopped due to obstacle at (1,4)"
+
+@pytest.mark.asyncio
+async def test_stream_persists_position(async_client: AsyncClient):
+    await async_client.post("/robots/rover-1/execute/stream", content=b"FF")
+
+    position = (await async_client.get("/robots/rover-1/position")).json()
+    assert position["x"] == 2
+    assert (await async_client.get("/position")).json()["x"] == 4
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, func
+from app.main import robot_service
+from app.models import RobotPosition, CommandExecution
+from app.persistence import WriteBehindWriter
+from tests.conftest import async_session_maker_test
+
+def _rows(i: int):
+    position = {"x": i, "y": 0, "direction": "NORTH"}
+    execution = {
+        "command_string": "F",
+        "initial_x": i - 1,
+        "initial_y": 0,
+        "initial_direction": "NORTH",
+        "final_x": i,
+        "final_y": 0,
+        "final_direction": "NORTH",
+        "obstacle_hit": None,
+    }
+    return position, execution
+
+async def _count(model) -> int:
+    async with async_session_maker_test() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+@pytest.mark.asyncio
+async def test_writer_flushes_in_batches(async_client: AsyncClient):
+    writer = WriteBehindWriter(async_session_maker_test, max_batch_size=2, max_latency=0.01)
+    flushed = []
+    flush = writer._flush
+
+    async def recording_flush(batch):
+        flushed.append(len(batch))
+        await flush(batch)
+
+    writer._flush = recording_flush
+    writer.start()
+    for i in range(5):
+        await writer.submit(*_rows(i))
+    await writer.close()
+
+    assert sum(flushed) == 5
+    assert max(flushed) <= 2
+    assert await _count(RobotPosition) == 5
+    assert await _count(CommandExecution) == 5
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_rows(async_client: AsyncClient):
+    writer = WriteBehindWriter(async_session_maker_test, max_batch_size=100, max_latency=10)
+    writer.start()
+    for i in range(3):
+        await writer.submit(*_rows(i))
+
+    await writer.close()
+
+    assert writer.pending == 0
+    assert await _count(CommandExecution) == 3
+    with pytest.raises(RuntimeError):
+        await writer.submit(*_rows(4))
+
+@pytest.mark.asyncio
+async def test_submit_waits_when_queue_is_full(async_client: AsyncClient):
+    writer = WriteBehindWriter(async_session_maker_test, max_queue_size=1)
+    await writer.submit(*_rows(0))
+
+    blocked = asyncio.create_task(writer.submit(*_rows(1)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    writer.start()
+    await asyncio.wait_for(blocked, 1)
+    await writer.close()
+    assert await _count(CommandExecution) == 2
+
+@pytest.mark.asyncio
+async def test_execute_returns_before_rows_are_written(async_client: AsyncClient):
+    writer = WriteBehindWriter(async_session_maker_test, max_latency=10)
+    robot_service.writer = writer
+    try:
+        response = await async_client.post("/execute", json={"commands": "F"})
+        assert response.status_code == 200
+        assert response.json()["final_position"]["x"] == 3
+        assert (await async_client.get("/position")).json()["x"] == 3
+        assert await _count(CommandExecution) == 0
+    finally:
+        robot_service.writer = None
+        await writer.close()
+
+    assert await _count(CommandExecution) == 1